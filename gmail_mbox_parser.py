@@ -2,21 +2,101 @@
 # ~*~ utf-8 ~*~
 # source at https://gist.github.com/benwattsjones/060ad83efd2b3afc8b229d41f9b246c4
 
-import mailbox
-import bs4
+import email.message
 
 
 def get_html_text(html):
-    try:
-        return bs4.BeautifulSoup(html, "lxml").body.get_text(" ", strip=True)
-    except AttributeError:  # message contents empty
+    # imported here so that only the message body API needs selectolax
+    from selectolax.lexbor import LexborHTMLParser
+
+    # Lexbor creates a <body> even for empty contents, so check them here
+    if not html or html.isspace():  # message contents empty
+        return None
+
+    body = LexborHTMLParser(html).body
+
+    if body is None:  # e.g. a frameset document
+        return None
+
+    return body.text(separator=" ", strip=True)
+
+
+def _find_header(header_block, lowered_block, name):
+    """Return the unfolded value of the first header with the lowercase
+    name in a header block that starts with a newline, or None."""
+    start = lowered_block.find(b"\n" + name + b":")
+    if start == -1:
         return None
+    start += len(name) + 2
+    end = start
+    # the value continues on lines that start with whitespace
+    while True:
+        end = header_block.find(b"\n", end)
+        if end == -1:
+            end = len(header_block)
+            break
+        if header_block[end + 1 : end + 2] not in (b" ", b"\t"):
+            break
+        end += 1
+    return header_block[start:end].decode("utf-8", "replace").strip()
+
+
+def _format_headers(headers):
+    """Summarize the parsed headers of a GmailMboxHeaders or
+    GmailMboxMessage for log messages."""
+    return (
+        f"X-Gmail-Labels: {headers.email_labels}, Date: {headers.email_date},"
+        f" From: {headers.email_from}, To: {headers.email_to}, Subject:"
+        f" {headers.email_subject}."
+    )
+
+
+class GmailMboxHeaders:
+    """The headers of a message that are needed to extract contacts.
+    Unlike GmailMboxMessage, no parsed message is kept, so instances are
+    small and cheap to pass between processes."""
+
+    __slots__ = (
+        "email_labels",
+        "email_date",
+        "email_from",
+        "email_to",
+        "email_subject",
+    )
+
+    def __init__(
+        self, email_labels, email_date, email_from, email_to, email_subject
+    ):
+        self.email_labels = email_labels
+        self.email_date = email_date
+        self.email_from = email_from
+        self.email_to = email_to
+        self.email_subject = email_subject
+
+    @classmethod
+    def from_raw_headers(cls, header_block):
+        """Extract the headers straight from the raw header block with
+        bytes.find instead of parsing every header into a message. A
+        missing header is None, like email.message.Message.get."""
+        # a leading newline lets the first header be found like the rest
+        header_block = b"\n" + header_block
+        lowered_block = header_block.lower()
+        return cls(
+            _find_header(header_block, lowered_block, b"x-gmail-labels"),
+            _find_header(header_block, lowered_block, b"date"),
+            _find_header(header_block, lowered_block, b"from"),
+            _find_header(header_block, lowered_block, b"to"),
+            _find_header(header_block, lowered_block, b"subject"),
+        )
+
+    def __str__(self) -> str:
+        return _format_headers(self)
 
 
 class GmailMboxMessage:
     def __init__(self, email_data):
-        if not isinstance(email_data, mailbox.mboxMessage):
-            raise TypeError("Variable must be type mailbox.mboxMessage")
+        if not isinstance(email_data, email.message.Message):
+            raise TypeError("Variable must be type email.message.Message")
         self.email_data = email_data
 
     def parse_email(self):
@@ -36,13 +116,15 @@ class GmailMboxMessage:
         return [self._read_email_text(msg) for msg in email_messages]
 
     def _get_email_messages(self, email_payload):
-        for msg in email_payload:
+        # depth-first walk with an explicit stack; parts are pushed in
+        # reverse so they are yielded in their original order
+        stack = list(reversed(email_payload))
+        while stack:
+            msg = stack.pop()
             if isinstance(msg, (list, tuple)):
-                for submsg in self._get_email_messages(msg):
-                    yield submsg
+                stack.extend(reversed(msg))
             elif msg.is_multipart():
-                for submsg in self._get_email_messages(msg.get_payload()):
-                    yield submsg
+                stack.extend(reversed(msg.get_payload()))
             else:
                 yield msg
 
@@ -67,11 +149,7 @@ class GmailMboxMessage:
         if not hasattr(self, "email_labels"):
             self.parse_email()
 
-        return (
-            f"X-Gmail-Labels: {self.email_labels}, Date: {self.email_date},"
-            f" From: {self.email_from}, To: {self.email_to}, Subject:"
-            f" {self.email_subject}."
-        )
+        return _format_headers(self)
 
 
 ######################### End of library, example of use below
@@ -1,25 +1,45 @@
 from __future__ import annotations
 
 import json
-import mailbox
-import re
+import mmap
+import os
+import stat
 from pathlib import Path
 from collections import defaultdict
 from typing import Any, Iterable, Generator
+from itertools import repeat
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import sys
 import logging
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
+from email.utils import getaddresses
 import loguru
 from loguru import logger
-from gmail_mbox_parser import GmailMboxMessage
-import vobject
-from vobject import vcard
+from gmail_mbox_parser import GmailMboxHeaders
+
+try:
+    import orjson
+except ImportError:  # fall back to the slower stdlib json module
+    orjson = None
 
 
 logger.disable("mylib")
 log_path = "log.txt"
 num_filtered_records = 0
 DEFAULT_OUT_PATH = "contacts.json"
+MESSAGES_PER_CHUNK = 1000
+PARALLEL_MIN_FILE_SIZE = 16 * 1024 * 1024
+PARSED_FIELDS_CACHE_SIZE = 4096
+
+_INVALID_NAME_CHARS = frozenset(".;:\n\r")
+# non-word characters that separate domain components, e.g. in
+# "mail-relay.example.com" or the address literal "[192.0.2.1]"
+_DOMAIN_SEPARATORS = str.maketrans("-[]:", "....")
+_VCARD_ESCAPE_TABLE = str.maketrans(
+    {"\\": "\\\\", ",": "\\,", ";": "\\;", "\n": "\\n"}
+)
+_VCARD_LINE_LENGTH = 75
 
 
 @logger.catch(reraise=True)
@@ -91,16 +111,42 @@ def level_filter(*levels: str) -> loguru.FilterFunction:
     return is_level
 
 
+def _rotated_log_file_paths() -> list[Path]:
+    """Return the paths of the files that the log file was rotated to,
+    named like "log.2024-01-01_00-00-00_000000.txt".
+
+    Returns:
+        list[Path]: The rotated log files, oldest first.
+    """
+    log_file_path = Path(log_path).resolve()
+
+    return sorted(
+        log_file_path.parent.glob(
+            f"{log_file_path.stem}.*{log_file_path.suffix}"
+        )
+    )
+
+
+def remove_rotated_log_files() -> None:
+    """Remove log files rotated during a previous run, so that the
+    rotated log files that are left are all from the current run."""
+    for rotated_log_file_path in _rotated_log_file_paths():
+        rotated_log_file_path.unlink(missing_ok=True)
+
+
 @contextmanager
 def print_warnings_summary():
     try:
         yield
     finally:
         if num_filtered_records:
+            log_file_paths = _rotated_log_file_paths()
+            log_file_paths.append(Path(log_path).resolve())
+            log_files_str = ", ".join(str(path) for path in log_file_paths)
             logger.info(
                 f"{num_filtered_records} warnings found! Please check the log"
-                " file to avoid missing potential contacts:"
-                f" {Path(log_path).resolve()}."
+                " file(s) to avoid missing potential contacts:"
+                f" {log_files_str}."
             )
 
 
@@ -113,20 +159,100 @@ def _load_json(json_file_path: str) -> Any:
     Returns:
         Any: A Python object with the deserialize data.
     """
-    with open(json_file_path, "r") as file:
-        return json.load(file)
+    data = Path(json_file_path).read_bytes()
+
+    if orjson:
+        return orjson.loads(data)
 
+    return json.loads(data)
 
-def _dump_to_json_file(data: Any, file_path: str | Path) -> None:
-    """Output data to the json file. Overwrites if the file already
-    exists.
+
+def _to_json_bytes(data: Any) -> bytes:
+    """Serialize data to UTF-8 encoded json.
 
     Args:
         data (Any): Any serializable data.
+
+    Returns:
+        bytes: The json document.
+    """
+    if orjson:
+        return orjson.dumps(data)
+
+    return json.dumps(data).encode()
+
+
+def _tee_to_json_file(
+    items: Iterable[Any], file_path: str | Path
+) -> Generator[Any, None, None]:
+    """Yield the items while writing them to a json file as a json
+    array. Items are written as they pass through, so they never need
+    to be held in memory together. Overwrites if the file already
+    exists. The file is complete once the generator is exhausted.
+
+    Args:
+        items (Iterable[Any]): Any serializable items.
         file_path (str | Path): Path for the output json file.
+
+    Yields:
+        Generator[Any, None, None]: The items.
     """
-    with open(Path(file_path), "w") as file:
-        json.dump(data, file)
+    with open(Path(file_path), "wb") as file:
+        separator = b"["
+
+        for item in items:
+            file.write(separator)
+            file.write(_to_json_bytes(item))
+            separator = b","
+            yield item
+
+        file.write(b"[]" if separator == b"[" else b"]")
+
+
+def _dump_array_to_json_file(
+    items: Iterable[Any], file_path: str | Path
+) -> None:
+    """Output items to the json file as a json array. Each item is
+    serialized and written on its own, so the whole document is never
+    held in memory. Overwrites if the file already exists.
+
+    Args:
+        items (Iterable[Any]): Any serializable items.
+        file_path (str | Path): Path for the output json file.
+    """
+    for _ in _tee_to_json_file(items, file_path):
+        pass
+
+
+def _fold_vcard_line(line: str) -> str:
+    """Fold a vCard content line so that no line is longer than 75
+    octets (RFC 6350 section 3.2) and terminate it with CRLF.
+
+    Args:
+        line (str): An unfolded vCard content line.
+
+    Returns:
+        str: The folded line.
+    """
+    if len(line) <= _VCARD_LINE_LENGTH and line.isascii():
+        return line + "\r\n"
+
+    folded = []
+    line_length = 0
+
+    for char in line:
+        char_length = len(char.encode())
+
+        # continuation lines start with a space
+        if line_length + char_length > _VCARD_LINE_LENGTH:
+            folded.append("\r\n ")
+            line_length = 1
+
+        folded.append(char)
+        line_length += char_length
+
+    folded.append("\r\n")
+    return "".join(folded)
 
 
 def _dump_to_vcf_file(
@@ -140,32 +266,35 @@ def _dump_to_vcf_file(
                 (email, names).
         file_path (str | Path): Path for the output vcf file.
     """
-    with open(Path(file_path), "w", newline="") as file:
-        for email, names in emails_with_names:
-            # all_valid_chars = re.compile(r"(?i)^[-a-z0-9]+$")
-            invalid_chars = re.compile(r"[.;:\n\r]")
-            valid_names = [
-                name.strip("'\"") for name in names if not invalid_chars.search(name)
-            ]
-            j = vobject.vCard()
-            name = (
-                valid_names[0] if valid_names and valid_names[0] else "No name"
-            )
-            j.add("n")
-            j.n.value = vcard.Name(name)
-            j.add("fn")
-            j.fn.value = name
-            j.add("email")
-            j.email.value = email.strip("'\"")
-            # j.email.type_param = "INTERNET"
-            note_value = r"\, ".join(valid_names)
+    vcard_lines = []
+
+    for email, names in emails_with_names:
+        # all_valid_chars = re.compile(r"(?i)^[-a-z0-9]+$")
+        valid_names = [
+            name for name in names if _INVALID_NAME_CHARS.isdisjoint(name)
+        ]
+        name = valid_names[0] if valid_names else "No name"
+        name = name.translate(_VCARD_ESCAPE_TABLE)
+        email = email.translate(_VCARD_ESCAPE_TABLE)
+        note_value = ", ".join(valid_names).translate(_VCARD_ESCAPE_TABLE)
+
+        lines = [
+            "BEGIN:VCARD",
+            "VERSION:3.0",
+            f"EMAIL:{email}",
+            f"FN:{name}",
+            f"N:{name};;;;",
+        ]
+
+        if note_value:
+            lines.append(f"NOTE:{note_value}")
 
-            if note_value:
-                j.add("note")
-                j.note.value = note_value
+        lines.append("END:VCARD")
+        vcard_lines.extend(_fold_vcard_line(line) for line in lines)
 
-            vcard_serialized = j.serialize()
-            file.write(vcard_serialized)
+    # one large write instead of one small write per contact
+    with open(Path(file_path), "wb") as file:
+        file.write("".join(vcard_lines).encode())
 
 
 def _ensure_is_file(path: Path | str, must_exist=False) -> None:
@@ -184,14 +313,19 @@ def _ensure_is_file(path: Path | str, must_exist=False) -> None:
         ValueError: Path exists but is to a non-file.
     """
     path = Path(path)
-    is_existing_file = path.is_file()
-    is_existing_path = path.exists()
-    abs_path = path.resolve()
 
-    if must_exist and not is_existing_path:
-        raise ValueError(f"Path does not exist but must exist: {abs_path}")
-    elif is_existing_path and not is_existing_file:
-        raise ValueError(f"Path exists but is to a non-file: {abs_path}")
+    # one stat call; the path is only resolved for the error messages
+    try:
+        mode = os.stat(path).st_mode
+    except (FileNotFoundError, NotADirectoryError):
+        if must_exist:
+            raise ValueError(
+                f"Path does not exist but must exist: {path.resolve()}"
+            ) from None
+        return
+
+    if not stat.S_ISREG(mode):
+        raise ValueError(f"Path exists but is to a non-file: {path.resolve()}")
 
 
 def _ensure_existing_file(path: str | Path, suffix: str = "") -> None:
@@ -234,108 +368,274 @@ def _ensure_existing_json_file(path: Path | str) -> None:
     _ensure_existing_file(path, suffix=".json")
 
 
+@lru_cache(maxsize=PARSED_FIELDS_CACHE_SIZE)
+def _parse_mbox_field(field: str) -> tuple[tuple[str, str], ...]:
+    """Parse the addresses in a "From" or "To" field. Surrounding quotes
+    are stripped from emails and names, and emails are lowercased. The
+    strings are interned since the same emails and names show up in
+    many different fields.
+
+    The same field often repeats many times in a mailbox (mailing lists,
+    notifications), so recently parsed fields are cached. The cache is
+    bounded since most "To" fields are unique.
+
+    Args:
+        field (str): A field of a .mbox file.
+
+    Returns:
+        tuple[tuple[str, str], ...]: The (email, name) tuples. name is
+            an empty string if the address has no name. Addresses
+            without an @, or with nothing before or after it, are left
+            out.
+    """
+    addresses = []
+
+    for name, email in getaddresses([field]):
+        email = email.strip().strip("'\"").lower()
+        local_part, _, domain = email.rpartition("@")
+
+        # checked after stripping: "'foo@'" strips to an email without a domain
+        if local_part and domain:
+            name = name.strip().strip("'\"")
+            addresses.append((sys.intern(email), sys.intern(name)))
+
+    # a tuple, since cached results are shared between calls
+    return tuple(addresses)
+
+
 def _mbox_fields_to_email_and_names_dict(
     mbox_fields: Iterable[str],
-) -> defaultdict[str, set]:
+) -> defaultdict[str, dict[str, None]]:
     """Convert mbox messages to a dict mapping emails to their
-    associated names.
+    associated names. The names of each email are kept as the keys of a
+    dict, which acts as an insertion-ordered set, so inserts stay fast
+    even for senders with thousands of display names (e.g. "X via
+    GitHub"). Surrounding quotes are stripped from emails and names, and
+    emails are lowercased, so the keys are canonical and later steps
+    don't need to normalize them.
 
     Args:
         mbox_fields (Iterable[str]): The fields of a .mbox file.
 
     Returns:
-        defaultdict[str, set]: A dict mapping emails to their associated
-            names.
+        defaultdict[str, dict[str, None]]: A dict mapping emails to
+            their associated names.
     """
-    email_to_names = defaultdict(set)
-
-    name_regex = r"(?P<name>[^<>,]*?)[<]?"
-    # https://stackabuse.com/python-validate-email-address-with-regular-expressions-regex/
-    email_regex = r"(?P<email>([-!#-'*+/-9=?A-Z^-~]+(\.[-!#-'*+/-9=?A-Z^-~]+)*|\"([]!#-[^-~ \t]|(\\[\t -~]))+\")@([-!#-'*+/-9=?A-Z^-~]+(\.[-!#-'*+/-9=?A-Z^-~]+)*|\[[\t -Z^-~]*]))"  # noqa: E501
-    name_email_regex = name_regex + email_regex
+    email_to_names = defaultdict(dict)
 
     for field in mbox_fields:
-        matches = re.finditer(name_email_regex, field)
+        addresses = _parse_mbox_field(field)
 
-        exists_match = False
+        if not addresses:
+            logger.warning("Skipping - No email(s) found in field: {}", field)
+            continue
 
-        for match in matches:
-            email = match.group("email").strip()
-            name = match.group("name").strip()
+        for email, name in addresses:
+            names = email_to_names[email]
 
             if name:
-                email_to_names[email].add(name)
-            else:
-                email_to_names[email]
-
-            exists_match = True
-
-        if not exists_match:
-            logger.warning(f"Skipping - No email(s) found in field: {field}")
-            continue
+                names[name] = None
 
     return email_to_names
 
 
-def _dict_with_set_to_hashable(
-    email_to_name: dict[str, set[str]]
-) -> Generator[tuple[str, tuple[str, ...]], None, None]:
-    """Return a hashable version of a dict mapping emails to their
-    associated names.
+@contextmanager
+def _open_mbox_mmap(
+    mbox_file_path: str,
+) -> Generator[mmap.mmap | None, None, None]:
+    """Memory-map the mbox file read-only. The kernel is advised that
+    the file will be read sequentially.
 
     Args:
-        email_to_name (dict[str, set]): A dict mapping emails to
-            their associated names.
+        mbox_file_path (str): The path to the mbox file.
 
     Yields:
-        Generator[tuple[str, tuple], None, None]: _description_
+        Generator[mmap.mmap | None, None, None]: The memory-mapped file
+            or None if the file is empty (empty files can't be mapped).
     """
-    return ((email, tuple(names)) for email, names in email_to_name.items())
+    with open(mbox_file_path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            yield None
+            return
 
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
 
-def _parse_mbox_file_to_contacts_fields_list(
-    mbox_file_path: str, omit_from_fields=False, omit_to_fields=False
-) -> list[str]:
-    """Return a list with the "From" and "To" fields in the mbox file.
+            yield mm
+
+
+@contextmanager
+def _process_pool_executor() -> Generator[ProcessPoolExecutor, None, None]:
+    """Start a process pool that is shut down on exit. If the block is
+    left early by an exception (including closing a generator that uses
+    the pool), chunks that haven't started yet are cancelled instead of
+    waiting for them to be parsed.
+
+    Yields:
+        Generator[ProcessPoolExecutor, None, None]: The process pool.
+    """
+    executor = ProcessPoolExecutor()
+
+    try:
+        yield executor
+    except BaseException:
+        executor.shutdown(cancel_futures=True)
+        raise
+
+    executor.shutdown()
+
+
+def _find_mbox_message_offsets(mbox_file_path: str) -> list[int]:
+    """Return the byte offsets of the messages in the mbox file. As with
+    mailbox.mbox, every line starting with "From " begins a message.
 
     Args:
         mbox_file_path (str): The path to the mbox file.
-        omit_from_fields (bool, optional): If True, "From" fields will
-            be ignored. Defaults to False.
-        omit_to_fields (bool, optional): If True, "To" fields will
-            be ignored. Defaults to False.
+
     Returns:
-        list[str]: A list with the fields in the mbox file.
+        list[int]: The byte offset of each message's "From " line.
     """
-    mb = mailbox.mbox(mbox_file_path)
-    num_entries = len(mb)
-    contacts_list = []
+    offsets = []
 
-    if omit_from_fields and omit_to_fields:
-        return contacts_list
+    with _open_mbox_mmap(mbox_file_path) as mm:
+        if mm is None:
+            return offsets
 
-    for email_obj in mb:
-        email_data = GmailMboxMessage(email_obj)
-        email_data.parse_email()
+        if mm[:5] == b"From ":
+            offsets.append(0)
 
-        if not omit_from_fields:
-            if email_data.email_from:
-                contacts_list.append(email_data.email_from)
-            else:
-                logger.warning(
-                    f"skipping mbox message - empty 'From:': {email_data}"
-                )
+        position = mm.find(b"\nFrom ")
+
+        while position != -1:
+            offsets.append(position + 1)
+            position = mm.find(b"\nFrom ", position + 1)
+
+    return offsets
+
+
+def _find_header_end(mm: mmap.mmap, start: int, stop: int) -> int:
+    """Return the offset of the blank line that ends a header block.
+    The header lines are walked one at a time, so the search stops at
+    the blank line and never scans the message body.
+
+    Args:
+        mm (mmap.mmap): The memory-mapped mbox file.
+        start (int): The offset of the newline ending the "From "
+            envelope line, so that an empty header block is also found.
+        stop (int): The offset where the message ends.
+
+    Returns:
+        int: The offset of the blank line or stop if there is none.
+    """
+    line_start = start + 1
+
+    while line_start < stop:
+        line_end = mm.find(b"\n", line_start, stop)
+
+        if line_end == -1:
+            break
+
+        # a blank line is empty or only "\r" in files with CRLF endings
+        if line_end == line_start or mm[line_start:line_end] == b"\r":
+            return line_start
+
+        line_start = line_end + 1
+
+    return stop
+
+
+def _read_mbox_headers_chunk(
+    mbox_file_path: str, offsets: list[int]
+) -> list[GmailMboxHeaders]:
+    """Parse the headers of a run of consecutive messages in the mbox
+    file. Runs in a worker process. Only the header blocks are sliced
+    out of the memory-mapped file, so bodies are never read.
+
+    Args:
+        mbox_file_path (str): The path to the mbox file.
+        offsets (list[int]): The byte offsets of the messages followed by
+            the offset where the last message ends.
+
+    Returns:
+        list[GmailMboxHeaders]: The headers of the messages.
+    """
+    messages = []
 
-        if not omit_to_fields:
-            if email_data.email_to:
-                contacts_list.append(email_data.email_to)
+    with _open_mbox_mmap(mbox_file_path) as mm:
+        for start, stop in zip(offsets, offsets[1:]):
+            # skip the "From " envelope line
+            envelope_end = mm.find(b"\n", start, stop)
+
+            if envelope_end == -1:
+                header_block = b""
             else:
-                logger.warning(
-                    f"skipping mbox message - empty 'To:': {email_data}"
-                )
+                header_end = _find_header_end(mm, envelope_end, stop)
+                header_block = mm[envelope_end + 1 : header_end]
+
+            messages.append(GmailMboxHeaders.from_raw_headers(header_block))
 
-    logger.info(f"entries in '{mbox_file_path}': {num_entries}")
-    return contacts_list
+    return messages
+
+
+def _iter_mbox_file_contacts_fields(
+    mbox_file_path: str, omit_from_fields=False, omit_to_fields=False
+) -> Generator[str, None, None]:
+    """Yield the "From" and "To" fields in the mbox file. Only the
+    headers of each message are parsed. Messages are parsed in chunks,
+    across worker processes for files of at least PARALLEL_MIN_FILE_SIZE
+    bytes, and the fields are yielded in mbox order.
+
+    Args:
+        mbox_file_path (str): The path to the mbox file.
+        omit_from_fields (bool, optional): If True, "From" fields will
+            be ignored. Defaults to False.
+        omit_to_fields (bool, optional): If True, "To" fields will
+            be ignored. Defaults to False.
+    Yields:
+        Generator[str, None, None]: The fields in the mbox file.
+    """
+    if omit_from_fields and omit_to_fields:
+        return
+
+    file_size = Path(mbox_file_path).stat().st_size
+    offsets = _find_mbox_message_offsets(mbox_file_path)
+    boundaries = offsets + [file_size]
+    chunks = [
+        boundaries[i : i + MESSAGES_PER_CHUNK + 1]
+        for i in range(0, len(offsets), MESSAGES_PER_CHUNK)
+    ]
+
+    with ExitStack() as stack:
+        # starting worker processes costs more than small files take
+        if file_size < PARALLEL_MIN_FILE_SIZE:
+            map_chunks = map
+        else:
+            map_chunks = stack.enter_context(_process_pool_executor()).map
+
+        for messages in map_chunks(
+            _read_mbox_headers_chunk, repeat(mbox_file_path), chunks
+        ):
+            for email_data in messages:
+                if not omit_from_fields:
+                    if email_data.email_from:
+                        yield email_data.email_from
+                    else:
+                        logger.warning(
+                            "skipping mbox message - empty 'From:': {}",
+                            email_data,
+                        )
+
+                if not omit_to_fields:
+                    if email_data.email_to:
+                        yield email_data.email_to
+                    else:
+                        logger.warning(
+                            "skipping mbox message - empty 'To:': {}",
+                            email_data,
+                        )
+
+    logger.info(f"entries in '{mbox_file_path}': {len(offsets)}")
 
 
 def _mbox_fields_to_emails_with_names(
@@ -367,59 +667,79 @@ def _mbox_fields_to_emails_with_names(
             names is a tuple with all names for the email.
     """
     email_to_names = _mbox_fields_to_email_and_names_dict(mbox_fields)
-    hashable_email_to_names = _dict_with_set_to_hashable(email_to_names)
 
-    def to_domain_components_and_email(
-        email_with_names: tuple[str, tuple[str, ...]]
-    ) -> tuple[str, ...]:
-        """Return  the domain components in reverse followed by the
-        email given the email and its associated names).
+    def to_domain(email: str) -> str:
+        """Return the domain of the email.
 
         Args:
-            email_with_names (tuple[str, tuple[str, ...]]): tuple as
-                (email, names).
+            email (str): An email. It must already be stripped and
+                lowercased.
 
         Raises:
             ValueError: Invalid email: no @ in the email.
-            ValueError: Invalid email: more than 1 @ in email.
             ValueError: Invalid email: no domain found (nothing after
                 @).
 
         Returns:
-            tuple[str, ...]: A tuple with the domain components in
-                reverse followed by the email.
+            str: The domain of the email.
         """
-        email, _ = email_with_names
-        email = email.strip().lower()
-        num_ats = email.count("@")
+        _, at, domain = email.rpartition("@")
 
-        if num_ats < 1:
+        if not at:
             raise ValueError(f"Invalid email: no @ in the email: '{email}'")
-        elif num_ats > 1:
-            raise ValueError("Invalid email: more than 1 @ in the email!")
-
-        domain = email.split("@")[1]
 
         if not domain:
             raise ValueError(
                 f"Invalid email: no domain found (nothing after @): '{email}'"
             )
 
-        domain_parts = re.split(r"\W", domain)
+        return domain
+
+    def to_reversed_domain_components(domain: str) -> str:
+        """Return the domain components in reverse, packed into one
+        string so that sorting compares a single string per domain
+        instead of a tuple of strings.
+
+        Args:
+            domain (str): A domain.
+
+        Returns:
+            str: The domain components in reverse separated by "\\x01".
+                The separator sorts below any character in a domain, so
+                the order is the same as sorting by the tuple of domain
+                components.
+        """
+        domain_parts = domain.translate(_DOMAIN_SEPARATORS).split(".")
         domain_parts.reverse()
 
-        return (*domain_parts, email)
+        return "\x01".join(domain_parts)
 
-    emails_with_names = sorted(
-        hashable_email_to_names, key=to_domain_components_and_email
-    )
+    # There are far fewer domains than emails, so group the emails by
+    # domain, sort the domains, and then sort the emails of each domain.
+    domain_to_emails_with_names = defaultdict(list)
+
+    for email, names in email_to_names.items():
+        domain_to_emails_with_names[to_domain(email)].append(
+            (email, tuple(names))
+        )
+
+    emails_with_names = []
+
+    for domain in sorted(
+        domain_to_emails_with_names, key=to_reversed_domain_components
+    ):
+        domain_emails_with_names = domain_to_emails_with_names[domain]
+        # emails are unique, so the tuples are only compared by email;
+        # sorting in place avoids copying each domain's list
+        domain_emails_with_names.sort()
+        emails_with_names.extend(domain_emails_with_names)
 
     if not out_file_path:
         out_file_path = DEFAULT_OUT_PATH
 
     out_file_path = Path(out_file_path)
 
-    _dump_to_json_file(emails_with_names, out_file_path)
+    _dump_array_to_json_file(emails_with_names, out_file_path)
     logger.info(
         "contact email addresses with their names written to"
         f" '{out_file_path.resolve()}"
@@ -429,9 +749,9 @@ def _mbox_fields_to_emails_with_names(
         "emails only - " + out_file_path.stem
     )
 
-    emails_only = tuple(email for email, _ in emails_with_names)
-
-    _dump_to_json_file(emails_only, emails_only_out_file_path)
+    _dump_array_to_json_file(
+        (email for email, _ in emails_with_names), emails_only_out_file_path
+    )
     logger.info(
         "contact email addresses written to"
         f" '{emails_only_out_file_path.resolve()}"
@@ -528,7 +848,7 @@ def get_contact_emails_with_names_from_mbox(
         )
         return []
 
-    fields = _parse_mbox_file_to_contacts_fields_list(
+    fields = _iter_mbox_file_contacts_fields(
         mbox_file_path,
         omit_from_fields=omit_from_fields,
         omit_to_fields=omit_to_fields,
@@ -553,10 +873,16 @@ def get_contact_emails_with_names_from_mbox(
             mbox_path.stem + " - " + field_types_str + " fields.json"
         )
 
-        _dump_to_json_file(fields, dump_json_path)
+        fields = _tee_to_json_file(fields, dump_json_path)
+
+    emails_with_names = _mbox_fields_to_emails_with_names(
+        fields, out_file_path
+    )
+
+    if dump_fields_to_json:
         logger.info(f"mbox fields written to '{dump_json_path.resolve()}'")
 
-    return _mbox_fields_to_emails_with_names(fields, out_file_path)
+    return emails_with_names
 
 
 if __name__ == "__main__":
@@ -566,9 +892,12 @@ if __name__ == "__main__":
 
     logger.enable("mylib")
     logger.remove()
+    # log.txt is truncated by mode="w", and old rotated files go too
+    remove_rotated_log_files()
     logger.add(
         log_path,
         mode="w",
+        rotation="50 MB",
         level=logging.DEBUG,
         enqueue=True,
         backtrace=True,
@@ -580,7 +909,7 @@ if __name__ == "__main__":
 
     logger.add(
         sys.stdout,
-        level=logging.DEBUG,
+        level=logging.INFO,
         enqueue=True,
         backtrace=True,
         diagnose=True,